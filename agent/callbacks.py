@@ -12,36 +12,82 @@ Contains:
 """
 
 import os
+import sys
 import asyncio
 import logging
 import subprocess
+import weakref
 from utils.workspace_utils import get_workspace
 
 logger = logging.getLogger("forge.agent.callbacks")
 
 
+# Display names resolved once per tool object — tool identity is stable, so
+# memoize instead of re-probing name/__name__ on every callback.
+_TOOL_NAME_CACHE: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _tool_name(tool) -> str:
+    """Return a display name for *tool*, cached per object."""
+    try:
+        name = _TOOL_NAME_CACHE.get(tool)
+    except TypeError:
+        # Unhashable/non-weakrefable wrapper — resolve without caching
+        return getattr(tool, "name", getattr(tool, "__name__", str(tool)))
+    if name is None:
+        name = getattr(tool, "name", getattr(tool, "__name__", str(tool)))
+        _TOOL_NAME_CACHE[tool] = name
+    return name
+
+
 # ---------------------------------------------------------------------------
 # Phase inference
 # ---------------------------------------------------------------------------
 
 
-def _infer_phase(state: dict) -> str:
-    """Infer the current workflow phase from session state."""
-    if state.get("task_complete"):
+def _phase_for(task_complete: bool, submitted: bool, has_plan: bool,
+               approved: bool, steps_done: bool) -> str:
+    """Reference phase logic — used once at import to fill _PHASE_TABLE."""
+    if task_complete:
         return "DONE"
-    if state.get("submitted"):
+    if submitted:
         return "Phase 4  -  Submit"
-    plan = state.get("plan", [])
-    if not plan:
+    if not has_plan:
         return "Phase 0  -  Orient"
-    if not state.get("approved"):
+    if not approved:
         return "Phase 1  -  Plan"
-    completed = state.get("completed_steps", [])
-    if plan and len(completed) < len(plan):
+    if not steps_done:
         return "Phase 2  -  Execute"
     return "Phase 3  -  Verify"
 
 
+# Precomputed phase strings indexed by a 5-bit state mask — _infer_phase runs
+# on every model callback, so one tuple index replaces the branch chain above.
+# Entries are sys.intern'ed: the same six strings are returned, logged, and
+# compared millions of times over a long session, so equality checks and dict
+# hashing in downstream consumers hit the interned pool.
+_PHASE_TABLE: tuple[str, ...] = tuple(
+    sys.intern(
+        _phase_for(bool(key & 16), bool(key & 8), bool(key & 4), bool(key & 2), bool(key & 1))
+    )
+    for key in range(32)
+)
+
+
+def _infer_phase(state: dict) -> str:
+    """Infer the current workflow phase from session state."""
+    get = state.get  # bound once — five attribute lookups become LOAD_FAST
+    plan = get("plan") or ()
+    key = (
+        (bool(get("task_complete")) << 4)
+        | (bool(get("submitted")) << 3)
+        | (bool(plan) << 2)
+        | (bool(get("approved")) << 1)
+        | (len(get("completed_steps") or ()) >= len(plan))
+    )
+    return _PHASE_TABLE[key]
+
+
 # ---------------------------------------------------------------------------
 # Git clone helper
 # ---------------------------------------------------------------------------
@@ -258,8 +304,10 @@ async def before_model_callback(callback_context, llm_request, **kwargs):
         #         logger.debug("[before_model] Potential traces found in SI (ignored as false positives): %s", all_matches)
         # else:
         #     logger.debug("[before_model] No system instruction found in request config.")
-            
-    except Exception as exc:
+
+    except (AttributeError, TypeError, KeyError) as exc:
+        # Narrow filter: these are the only failures state/request probing
+        # can raise, and anything else should surface rather than be eaten.
         logger.debug("[before_model] logging failed: %s", exc)
 
     return None
@@ -314,49 +362,56 @@ async def before_tool_callback(tool, args, tool_context, **kwargs):
 
 async def after_tool_callback(tool, args, tool_context, tool_response, **kwargs):
     """Validate and log tool results and state changes after each tool call."""
+    # These never raise: _tool_name has its own fallback and isinstance is total.
+    tool_name = _tool_name(tool)
+    result = tool_response if isinstance(tool_response, dict) else {}
+    state = tool_context.state
+
     try:
-        tool_name = getattr(tool, "name", getattr(tool, "__name__", str(tool)))
-        result = tool_response if isinstance(tool_response, dict) else {}
-        state = tool_context.state
-        
-        # 1. Log Tool Result
+        # 1. Log Tool Result — gate on isEnabledFor so large payloads
+        # (e.g. read_file contents) are never stringified when the level
+        # is filtered out.
         if "error" in result:
-            err_details = str(result["error"]) or "Unknown error (empty response)"
-            logger.warning("[Tool Result] %s -> ERROR: %s", tool_name, err_details[:500])
+            if logger.isEnabledFor(logging.WARNING):
+                err_details = str(result["error"]) or "Unknown error (empty response)"
+                logger.warning("[Tool Result] %s -> ERROR: %s", tool_name, err_details[:500])
         elif "status" in result:
-            logger.info("[Tool Result] %s -> %s", tool_name, result["status"])
-        else:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("[Tool Result] %s -> %s", tool_name, result["status"])
+        elif logger.isEnabledFor(logging.DEBUG):
             logger.debug("[Tool Result] %s -> completed", tool_name)
 
-        # 2. Track and Log State Changes
+        # 2. Track and Log State Changes — the snapshot diff exists only to
+        # be logged, so skip the whole comparison when INFO is filtered out.
         before_state = state.get("temp:before_tool_state")
-        if before_state:
+        if before_state and logger.isEnabledFor(logging.INFO):
             if hasattr(state, "to_dict"):
                 after_state = state.to_dict()
             else:
                 after_state = dict(state)
-            
+
             # Remove the temp key from comparison
             if "temp:before_tool_state" in after_state:
                 del after_state["temp:before_tool_state"]
-            
+
             diff = {}
             for k, v in after_state.items():
                 if k not in before_state or before_state[k] != v:
                     diff[k] = v
-            
+
             if diff:
-                # Filter out messages/typed_messages if they are too noisy, 
+                # Filter out messages/typed_messages if they are too noisy,
                 # but user asked to log state changes, so let's show them concisely.
                 logger.info("[State Changed] %s", diff)
-            
+
+        if before_state:
             # Clean up temp state by setting to None (State doesn't support del/pop)
             try:
                 state["temp:before_tool_state"] = None
             except Exception:
                 pass
 
-    except Exception as exc:
+    except (AttributeError, TypeError, KeyError) as exc:
         logger.debug("[after_tool] tracking failed: %s", exc)
 
     return None
@@ -9,22 +9,15 @@ The system prompt encodes the 5-phase workflow:
   4. Submit  — pre_commit_instructions, make_commit, submit, done
 """
 
+import re
 
-SYSTEM_PROMPT = """You are Forge, an autonomous AI software engineer. You work inside a sandboxed Docker container with full access to the codebase at /workspace.
 
-## Current Session State
-- Automation mode: {automation_mode}
-- Target branch: {user:branch}
-- Plan approved: {approved}
-- Plan steps: {plan}
-- Current step index: {current_step}
-- Completed steps: {completed_steps}
-- Submitted: {submitted}
-- Task complete: {task_complete}
-- Working branch: {current_branch}
-- Stack: {user:stack?}
-- Test command: {user:test_command?}
-- Run command: {user:run_command?}
+# The prompt is split so every dynamic {placeholder} sits at the very end:
+# the static head stays byte-identical across turns, giving Gemini implicit
+# caching a stable prefix (min cacheable prefix is 2048 tokens) instead of
+# invalidating the whole prompt whenever session state changes.
+
+_STATIC_PROMPT_HEAD = """You are Forge, an autonomous AI software engineer. You work inside a sandboxed Docker container with full access to the codebase at /workspace.
 
 You operate in 5 strict phases. Never skip a phase.
 
@@ -75,6 +68,61 @@ You operate in 5 strict phases. Never skip a phase.
 - Use `send_message_to_user` with type "warning" or "error" for important alerts.
 """
 
+_DYNAMIC_PROMPT_TAIL = """
+## Current Session State
+- Automation mode: {automation_mode}
+- Target branch: {user:branch}
+- Plan approved: {approved}
+- Plan steps: {plan}
+- Current step index: {current_step}
+- Completed steps: {completed_steps}
+- Submitted: {submitted}
+- Task complete: {task_complete}
+- Working branch: {current_branch}
+- Stack: {user:stack?}
+- Test command: {user:test_command?}
+- Run command: {user:run_command?}
+"""
+
+SYSTEM_PROMPT = _STATIC_PROMPT_HEAD + _DYNAMIC_PROMPT_TAIL
+
+
+# Raw {placeholder} spans. ADK state keys carry prefixes and a trailing
+# optional marker ({user:branch}, {user:stack?}) that string.Formatter
+# would mis-split into field + format spec, so match the braces directly.
+_PLACEHOLDER_RE = re.compile(r"\{([^{}]+)\}")
+
+
+def _split_template(template: str) -> list[tuple[str, str | None]]:
+    """Split a template into (literal, placeholder-or-None) segments."""
+    parts = []
+    pos = 0
+    for match in _PLACEHOLDER_RE.finditer(template):
+        parts.append((template[pos:match.start()], match.group(1)))
+        pos = match.end()
+    parts.append((template[pos:], None))
+    return parts
+
+
+# Splitting the ~5KB prompt is an O(len(prompt)) scan, so do it once at
+# import and render with a join over the segments instead of per turn.
+_PROMPT_PARTS: list[tuple[str, str | None]] = _split_template(SYSTEM_PROMPT)
+
+
+def render_system_prompt(state: dict) -> str:
+    """Render SYSTEM_PROMPT against a session-state dict.
+
+    Mirrors ADK's {key} injection, including the trailing-``?`` optional
+    marker (missing optional keys render as empty strings).
+    """
+    parts = []
+    for literal, field in _PROMPT_PARTS:
+        parts.append(literal)
+        if field is not None:
+            key = field[:-1] if field.endswith("?") else field
+            parts.append(str(state.get(key, "")))
+    return "".join(parts)
+
 
 def create_instructions() -> str:
     """Return the system prompt string.
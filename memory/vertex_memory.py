@@ -8,9 +8,12 @@ Dual-mode:
 The mode is determined by the SERVICE_MODE env var (default: "dev").
 """
 
-import os
+import functools
+import threading
 from typing import Optional
 
+from utils.env_utils import env_snapshot
+
 from google.adk.sessions import (
     InMemorySessionService,
     VertexAiSessionService,
@@ -22,21 +25,49 @@ from google.adk.memory import (
 )
 
 
+# Per-mode singletons — prod-mode services open network-backed clients
+# (Firestore / Vertex gRPC channels), so build each at most once per mode.
+_SERVICE_CACHE: dict[tuple[str, str], object] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def _clear_service_cache():
+    """Drop cached service singletons (used by tests)."""
+    with _CACHE_LOCK:
+        _SERVICE_CACHE.clear()
+
+
 def create_session_service(mode: str | None = None):
     """Create the appropriate session service.
 
+    Returns a per-mode singleton — prod-mode construction opens network
+    clients, so repeated calls share one instance.
+
     Args:
         mode: "dev" or "prod". Defaults to SERVICE_MODE env var or "dev".
 
     Returns:
         InMemorySessionService for dev, VertexAiSessionService for prod.
     """
-    mode = mode or os.environ.get("SERVICE_MODE", "dev")
+    mode = mode or env_snapshot().service_mode
+
+    service = _SERVICE_CACHE.get(("session", mode))
+    if service is not None:
+        return service
+    with _CACHE_LOCK:
+        service = _SERVICE_CACHE.get(("session", mode))
+        if service is None:
+            service = _build_session_service(mode)
+            _SERVICE_CACHE[("session", mode)] = service
+    return service
 
+
+def _build_session_service(mode: str):
     if mode == "prod":
-        project = os.environ.get("GOOGLE_CLOUD_PROJECT")
-        location = os.environ.get("GOOGLE_CLOUD_LOCATION", "us-central1")
-        agent_engine_id = os.environ.get("AGENT_ENGINE_ID")
+        env = env_snapshot()
+        project = env.project
+        location = env.location
+        agent_engine_id = env.agent_engine_id
 
         if not project:
             raise ValueError("GOOGLE_CLOUD_PROJECT env var required for prod mode")
@@ -53,17 +84,32 @@ def create_session_service(mode: str | None = None):
 def create_memory_service(mode: str | None = None) -> Optional[BaseMemoryService]:
     """Create the appropriate memory service.
 
+    Returns a per-mode singleton, mirroring ``create_session_service``.
+
     Args:
         mode: "dev" or "prod". Defaults to SERVICE_MODE env var or "dev".
 
     Returns:
         InMemoryMemoryService for dev, VertexAiMemoryBankService for prod.
     """
-    mode = mode or os.environ.get("SERVICE_MODE", "dev")
+    mode = mode or env_snapshot().service_mode
+
+    service = _SERVICE_CACHE.get(("memory", mode))
+    if service is not None:
+        return service
+    with _CACHE_LOCK:
+        service = _SERVICE_CACHE.get(("memory", mode))
+        if service is None:
+            service = _build_memory_service(mode)
+            _SERVICE_CACHE[("memory", mode)] = service
+    return service
+
 
+def _build_memory_service(mode: str) -> Optional[BaseMemoryService]:
     if mode == "prod":
-        project = os.environ.get("GOOGLE_CLOUD_PROJECT")
-        location = os.environ.get("GOOGLE_CLOUD_LOCATION", "us-central1")
+        env = env_snapshot()
+        project = env.project
+        location = env.location
 
         if not project:
             raise ValueError("GOOGLE_CLOUD_PROJECT env var required for prod mode")
@@ -76,11 +122,53 @@ def create_memory_service(mode: str | None = None) -> Optional[BaseMemoryService
     return InMemoryMemoryService()
 
 
+class Services:
+    """Lazy per-mode bundle of session and memory services.
+
+    Each service is built on first attribute access, so code paths that
+    only need one of the two never pay for constructing the other.
+    """
+
+    def __init__(self, mode: str):
+        self._mode = mode
+
+    @functools.cached_property
+    def session(self):
+        return create_session_service(self._mode)
+
+    @functools.cached_property
+    def memory(self) -> Optional[BaseMemoryService]:
+        return create_memory_service(self._mode)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_services(mode: str) -> Services:
+    return Services(mode)
+
+
+def get_services(mode: str | None = None) -> Services:
+    """Return the lazy service bundle for *mode* (cached per mode).
+
+    The mode is resolved from the environment *before* the cache lookup
+    (mirroring create_agent), so SERVICE_MODE changes take effect on the
+    next call instead of being pinned by whatever resolved first.
+    """
+    return _get_services(mode or env_snapshot().service_mode)
+
+
 def create_services(mode: str | None = None):
     """Create both session and memory services.
 
     Returns:
         Tuple of (session_service, memory_service).
     """
-    mode = mode or os.environ.get("SERVICE_MODE", "dev")
-    return create_session_service(mode), create_memory_service(mode)
+    services = get_services(mode)
+    return services.session, services.memory
+
+
+def _clear_all_caches():
+    _get_services.cache_clear()
+    _clear_service_cache()
+
+
+create_services.cache_clear = _clear_all_caches
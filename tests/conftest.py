@@ -1,17 +1,62 @@
 """Shared Pytest fixtures for Forge tests."""
 
-import pytest
 import os
+import sys
+
+# Make the repo root importable once for the whole suite — individual test
+# modules should not repeat this.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from dataclasses import dataclass, field
+
+import pytest
+
+from utils.env_utils import env_snapshot
+
+
+def pytest_configure(config):
+    # Point tmp_path at tmpfs when available so file-tool tests hit RAM,
+    # not disk. Skipped when --basetemp is given (xdist workers get one).
+    if config.option.basetemp is None and os.access("/dev/shm", os.W_OK):
+        config.option.basetemp = f"/dev/shm/pytest-{os.getuid()}-forge"
+
 
+@pytest.fixture(autouse=True)
+def _fresh_env_snapshot():
+    """Invalidate the cached env snapshot so monkeypatch.setenv takes effect."""
+    env_snapshot.cache_clear()
+    yield
+    env_snapshot.cache_clear()
+
+def make_proc_mock(returncode: int = 0, stdout: bytes = b"", stderr: bytes = b""):
+    """Build a completed-process mock for subprocess.run tests.
+
+    Shared across test modules so each doesn't hand-wire the same
+    four-attribute MagicMock.
+    """
+    from unittest.mock import MagicMock
+
+    proc = MagicMock()
+    proc.returncode = returncode
+    proc.stdout = stdout
+    proc.stderr = stderr
+    return proc
+
+
+@dataclass(slots=True)
 class MockWorkspace:
-    def __init__(self):
-        # Use current working directory so subprocess calls don't fail with WinError 267
-        self.path = os.getcwd()
+    # Use current working directory so subprocess calls don't fail with WinError 267
+    path: str = field(default_factory=os.getcwd)
+
 
+@dataclass(slots=True)
 class MockToolContext:
-    """A minimal mock for google.adk.tools.ToolContext."""
-    
-    def __init__(self, state: dict | None = None):
-        self.state = state if state is not None else {}
-        self.workspace = MockWorkspace()
-        self.session_id = "test-session-1234"
+    """A minimal mock for google.adk.tools.ToolContext.
+
+    slots=True gives fixed-layout instances — these are allocated in
+    nearly every test, so skip the per-instance __dict__.
+    """
+
+    state: dict = field(default_factory=dict)
+    workspace: MockWorkspace = field(default_factory=MockWorkspace)
+    session_id: str = "test-session-1234"
@@ -1,24 +1,35 @@
 """Tests for agent/agent.py — agent creation, tool registration, and callbacks."""
 
-import os
-
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
 from agent.agent import (
     create_agent,
     ALL_TOOLS,
     SYSTEM_PROMPT,
 )
 
+from agent.instructions import render_system_prompt
+
 from agent.callbacks import (
     before_model_callback,
     after_tool_callback,
     _infer_phase,
 )
 
+import re
+
 import pytest
 
+# Matches {key} state-injection placeholders in the system prompt
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+# Canonical session-state keys pre-seeded in worker/main.py create_session()
+_VALID_STATE_KEYS = frozenset({
+    "automation_mode", "plan", "current_step", "completed_steps",
+    "approved", "submitted", "task_complete", "awaiting_approval",
+    "commit_message", "final_summary", "messages", "typed_messages",
+    "awaiting_user_input", "user_input_prompt", "pr_url", "pr_number",
+    "current_branch",
+})
+
 
 class TestCreateAgent:
     def test_creates_agent(self):
@@ -63,22 +74,31 @@ class TestCreateAgent:
         assert agent.before_tool_callback is not None
 
 
+@pytest.fixture(scope="module")
+def tool_metadata():
+    """One pass over ALL_TOOLS shared by the callable/async checks."""
+    import asyncio
+    from google.adk.tools import BaseTool
+
+    return [
+        (tool, isinstance(tool, BaseTool), callable(tool), asyncio.iscoroutinefunction(tool))
+        for tool in ALL_TOOLS
+    ]
+
+
 class TestAllTools:
     def test_tool_count(self):
         assert len(ALL_TOOLS) == 30
 
-    def test_all_tools_are_callable(self):
-        from google.adk.tools import BaseTool
-        for tool in ALL_TOOLS:
+    def test_all_tools_are_callable(self, tool_metadata):
+        for tool, is_base_tool, is_callable, _ in tool_metadata:
             # ADK tools are objects, raw tools are callables
-            assert callable(tool) or isinstance(tool, BaseTool), f"{tool} is neither callable nor a BaseTool"
+            assert is_callable or is_base_tool, f"{tool} is neither callable nor a BaseTool"
 
-    def test_all_tools_are_async(self):
-        import asyncio
-        from google.adk.tools import BaseTool
-        for tool in ALL_TOOLS:
-            if not isinstance(tool, BaseTool):
-                assert asyncio.iscoroutinefunction(tool), f"{tool.__name__} is not async"
+    def test_all_tools_are_async(self, tool_metadata):
+        for tool, is_base_tool, _, is_coro in tool_metadata:
+            if not is_base_tool:
+                assert is_coro, f"{tool.__name__} is not async"
 
 
 class TestSystemPrompt:
@@ -136,23 +156,34 @@ class TestCallbacks:
         assert result is None
 
 
+class TestRenderSystemPrompt:
+    """Verify render_system_prompt handles ADK's prefixed and optional keys."""
+
+    def test_renders_user_prefixed_keys(self):
+        rendered = render_system_prompt({
+            "automation_mode": "NONE",
+            "user:branch": "release",
+            "user:stack": "python",
+        })
+        assert "Target branch: release" in rendered
+        assert "Stack: python" in rendered
+
+    def test_missing_optional_keys_render_empty(self):
+        rendered = render_system_prompt({})
+        assert "Test command: \n" in rendered
+
+    def test_no_unrendered_placeholders(self):
+        rendered = render_system_prompt({})
+        assert "{" not in rendered
+
+
 class TestStateInjectionKeys:
     """Verify system prompt {key} placeholders match actual state keys."""
 
     def test_all_placeholders_are_valid_state_keys(self):
-        import re
         # Extract all {key} placeholders from the system prompt
-        placeholders = set(re.findall(r"\{(\w+)\}", SYSTEM_PROMPT))
-
-        # These are the keys pre-seeded in worker/main.py create_session()
-        valid_state_keys = {
-            "automation_mode", "plan", "current_step", "completed_steps",
-            "approved", "submitted", "task_complete", "awaiting_approval",
-            "commit_message", "final_summary", "messages", "typed_messages",
-            "awaiting_user_input", "user_input_prompt", "pr_url", "pr_number",
-            "current_branch",
-        }
-
-        missing = placeholders - valid_state_keys
+        placeholders = set(_PLACEHOLDER_RE.findall(SYSTEM_PROMPT))
+
+        missing = placeholders - _VALID_STATE_KEYS
         assert not missing, f"System prompt uses {{key}} placeholders not in session state: {missing}"
 
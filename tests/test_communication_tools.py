@@ -1,18 +1,16 @@
 """Tests for tools/communication_tools.py — all 7 communication tools (async)."""
 
-import os
+import json
 
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 from tools.planning_tools import (
     set_plan,
     plan_step_complete,
     record_user_approval_for_plan,
 )
-from tests.conftest import MockToolContext
+from tests.conftest import MockToolContext, make_proc_mock
+import tools.communication_tools as communication_tools
 from tools.communication_tools import (
     message_user,
     request_user_input,
@@ -30,20 +28,62 @@ import pytest
 # ---------------------------------------------------------------------------
 
 
+# Canned gh CLI JSON payload — built once at import, shared by read tests
+_COMMENTS_JSON_BYTES = json.dumps({
+    "comments": [
+        {
+            "author": {"login": "reviewer"},
+            "body": "LGTM",
+            "createdAt": "2026-01-01T00:00:00Z",
+        }
+    ]
+}).encode()
+
+
+# gh CLI subprocess tests share the conftest completed-process factory
+_gh_proc = make_proc_mock
+
+
+@pytest.fixture(autouse=True)
+def _no_github_token(monkeypatch):
+    """The PR tools prefer the REST path when GITHUB_TOKEN is set — keep
+    the gh CLI tests deterministic regardless of the host environment."""
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+
+
 @pytest.fixture
 def ctx():
     """Fresh MockToolContext with empty state."""
     return MockToolContext()
 
 
+@pytest.fixture(scope="session")
+def _approved_state_template():
+    """Approved, fully-completed plan state — built once per session.
+
+    Built synchronously via asyncio.run so the template doesn't need a
+    session-scoped event loop; per-test fixtures deep-copy it.
+    """
+    import asyncio
+
+    async def _build():
+        tc = MockToolContext()
+        await set_plan(["Step 1", "Step 2"], tc)
+        await record_user_approval_for_plan(tc)
+        await plan_step_complete(0, "Done 0", tc)
+        await plan_step_complete(1, "Done 1", tc)
+        return tc.state
+
+    return asyncio.run(_build())
+
+
 @pytest.fixture
-async def ctx_approved():
+def ctx_approved(_approved_state_template):
     """ToolContext with an approved, fully-completed plan."""
+    import copy
+
     tc = MockToolContext()
-    await set_plan(["Step 1", "Step 2"], tc)
-    await record_user_approval_for_plan(tc)
-    await plan_step_complete(0, "Done 0", tc)
-    await plan_step_complete(1, "Done 1", tc)
+    tc.state = copy.deepcopy(_approved_state_template)
     return tc
 
 
@@ -101,11 +141,12 @@ class TestRequestUserInput:
 # ---------------------------------------------------------------------------
 
 
-class TestSubmit:
-    @patch("tools.communication_tools._run_git")
-    async def test_submits_when_ready(self, mock_run_git, ctx_approved):
-        # Mock: git add, git commit, git rev-parse, git push, gh pr create
-        mock_run_git.side_effect = [
+# One row per git-mocked submit scenario:
+# (id, side_effect list, expected result keys, expected state entries)
+SUBMIT_CASES = [
+    (
+        "submits_when_ready",
+        [
             (0, "", ""),                          # git checkout -b
             (0, "", ""),                          # git add
             (0, "commit ok", ""),                  # git commit
@@ -114,13 +155,75 @@ class TestSubmit:
             (0, "https://github.com/org/repo/pull/42", ""),  # gh pr create
             (0, "", ""),                          # git checkout main
             (0, "", ""),                          # git pull origin main
-        ]
+        ],
+        {"status": "ok"},
+        {
+            "submitted": True,
+            "commit_message": "feat: login",
+            "pr_url": "https://github.com/org/repo/pull/42",
+            "pr_number": 42,
+        },
+    ),
+    (
+        "push_failure_returns_partial",
+        [
+            (0, "", ""),                  # git checkout -b
+            (0, "", ""),                  # git add
+            (0, "ok", ""),                # git commit
+            (0, "abc" * 13 + "a", ""),    # git rev-parse
+            (1, "", "no remote configured"),  # git push fails
+        ],
+        {"status": "partial", "push_error": ...},
+        {"submitted": True},
+    ),
+    (
+        "nothing_to_commit",
+        [
+            (0, "", ""),                              # git checkout -b
+            (0, "", ""),                              # git add
+            (1, "", "nothing to commit, working tree clean"),  # git commit
+        ],
+        {"error": "nothing to commit"},
+        {},
+    ),
+    (
+        "stores_state_fields",
+        [
+            (0, "", ""),                  # git checkout -b
+            (0, "", ""),                  # git add
+            (0, "ok", ""),                # git commit
+            (0, "deadbeef" * 5, ""),      # git rev-parse
+            (0, "", ""),                  # git push
+            (0, "https://github.com/org/repo/pull/7", ""),  # pr create
+            (0, "", ""),                  # checkout main
+            (0, "", ""),                  # pull main
+        ],
+        {"status": "ok"},
+        {"commit_message": "feat: login", "pr_number": 7},
+    ),
+]
+
+
+class TestSubmit:
+    @pytest.mark.parametrize(
+        "side_effect, expected_result, expected_state",
+        [case[1:] for case in SUBMIT_CASES],
+        ids=[case[0] for case in SUBMIT_CASES],
+    )
+    @patch.object(communication_tools, "_run_git")
+    async def test_git_scenarios(self, mock_run_git, side_effect, expected_result,
+                                 expected_state, ctx_approved):
+        mock_run_git.side_effect = side_effect
         result = await submit("feat: login", "login-feature", "Add login feature", tool_context=ctx_approved)
-        assert result["status"] == "ok"
-        assert ctx_approved.state["submitted"] is True
-        assert ctx_approved.state["commit_message"] == "feat: login"
-        assert ctx_approved.state["pr_url"] == "https://github.com/org/repo/pull/42"
-        assert ctx_approved.state["pr_number"] == 42
+        for key, expected in expected_result.items():
+            if expected is ...:
+                assert key in result
+            elif key == "error":
+                assert expected in result["error"].lower()
+            else:
+                assert result[key] == expected
+        for key, expected in expected_state.items():
+            assert ctx_approved.state[key] == expected
 
     async def test_rejects_without_approval(self, ctx):
         await set_plan(["Step 1"], ctx)
@@ -142,48 +245,6 @@ class TestSubmit:
         result = await submit("", "branch", "title", tool_context=ctx_approved)
         assert "error" in result
 
-    @patch("tools.communication_tools._run_git")
-    async def test_push_failure_returns_partial(self, mock_run_git, ctx_approved):
-        mock_run_git.side_effect = [
-            (0, "", ""),                  # git checkout -b
-            (0, "", ""),                  # git add
-            (0, "ok", ""),                # git commit
-            (0, "abc" * 13 + "a", ""),    # git rev-parse
-            (1, "", "no remote configured"),  # git push fails
-        ]
-        result = await submit("feat: test", "test-branch", "Test PR", tool_context=ctx_approved)
-        assert result["status"] == "partial"
-        assert "push_error" in result
-        assert ctx_approved.state["submitted"] is True
-
-    @patch("tools.communication_tools._run_git")
-    async def test_nothing_to_commit(self, mock_run_git, ctx_approved):
-        mock_run_git.side_effect = [
-            (0, "", ""),                              # git checkout -b
-            (0, "", ""),                              # git add
-            (1, "", "nothing to commit, working tree clean"),  # git commit
-        ]
-        result = await submit("msg", "branch", "title", tool_context=ctx_approved)
-        assert "error" in result
-        assert "nothing to commit" in result["error"].lower()
-        assert "clean" in result["error"].lower()
-
-    @patch("tools.communication_tools._run_git")
-    async def test_stores_state_fields(self, mock_run_git, ctx_approved):
-        mock_run_git.side_effect = [
-            (0, "", ""),                  # git checkout -b
-            (0, "", ""),                  # git add
-            (0, "ok", ""),                # git commit
-            (0, "deadbeef" * 5, ""),      # git rev-parse
-            (0, "", ""),                  # git push
-            (0, "https://github.com/org/repo/pull/7", ""), # pr create
-            (0, "", ""),                  # checkout main
-            (0, "", ""),                  # pull main
-        ]
-        await submit("feat: add auth", "auth-branch", "Add auth", tool_context=ctx_approved)
-        assert ctx_approved.state["commit_message"] == "feat: add auth"
-        assert ctx_approved.state["pr_number"] == 7
-
 
 # ---------------------------------------------------------------------------
 # done
@@ -226,23 +287,9 @@ class TestReadPrComments:
         result = await read_pr_comments(-1)
         assert "error" in result
 
-    @patch("tools.communication_tools.subprocess.run")
+    @patch.object(communication_tools.subprocess, "run")
     async def test_successful_read(self, mock_run):
-        import json
-        comments_data = {
-            "comments": [
-                {
-                    "author": {"login": "reviewer"},
-                    "body": "LGTM",
-                    "createdAt": "2026-01-01T00:00:00Z",
-                }
-            ]
-        }
-        mock_proc = MagicMock()
-        mock_proc.returncode = 0
-        mock_proc.stdout = json.dumps(comments_data).encode()
-        mock_proc.stderr = b""
-        mock_run.return_value = mock_proc
+        mock_run.return_value = _gh_proc(stdout=_COMMENTS_JSON_BYTES)
 
         result = await read_pr_comments(42)
         assert result["status"] == "ok"
@@ -250,13 +297,9 @@ class TestReadPrComments:
         assert result["comments"][0]["author"] == "reviewer"
         assert result["comments"][0]["body"] == "LGTM"
 
-    @patch("tools.communication_tools.subprocess.run")
+    @patch.object(communication_tools.subprocess, "run")
     async def test_gh_error(self, mock_run):
-        mock_proc = MagicMock()
-        mock_proc.returncode = 1
-        mock_proc.stdout = b""
-        mock_proc.stderr = b"not found"
-        mock_run.return_value = mock_proc
+        mock_run.return_value = _gh_proc(returncode=1, stderr=b"not found")
 
         result = await read_pr_comments(999)
         assert "error" in result
@@ -276,27 +319,99 @@ class TestReplyToPrComments:
         result = await reply_to_pr_comments(42, "")
         assert "error" in result
 
-    @patch("tools.communication_tools.subprocess.run")
+    @patch.object(communication_tools.subprocess, "run")
     async def test_successful_reply(self, mock_run):
-        mock_proc = MagicMock()
-        mock_proc.returncode = 0
-        mock_proc.stdout = b""
-        mock_proc.stderr = b""
-        mock_run.return_value = mock_proc
+        mock_run.return_value = _gh_proc()
 
         result = await reply_to_pr_comments(42, "Thanks for the review!")
         assert result["status"] == "ok"
         assert result["pr_number"] == 42
         assert result["body"] == "Thanks for the review!"
 
-    @patch("tools.communication_tools.subprocess.run")
+    @patch.object(communication_tools.subprocess, "run")
     async def test_gh_error_reply(self, mock_run):
-        mock_proc = MagicMock()
-        mock_proc.returncode = 1
-        mock_proc.stdout = b""
-        mock_proc.stderr = b"permission denied"
-        mock_run.return_value = mock_proc
+        mock_run.return_value = _gh_proc(returncode=1, stderr=b"permission denied")
 
         result = await reply_to_pr_comments(42, "reply")
         assert "error" in result
 
+
+# ---------------------------------------------------------------------------
+# GitHub REST path (used when GITHUB_TOKEN is set)
+# ---------------------------------------------------------------------------
+
+
+class _FakeGhResponse:
+    def __init__(self, data, status_code=200):
+        self._data = data
+        self.status_code = status_code
+        self.content = b"{}"
+
+    def json(self):
+        return self._data
+
+
+class _FakeGhClient:
+    def __init__(self, response):
+        self._response = response
+        self.calls = []
+
+    async def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        return self._response
+
+
+def _install_rest(monkeypatch, response):
+    """Point the REST path at a fake client and a resolved repo slug.
+
+    The tools go through the shared _get_gh_client(), so that is the
+    patch target.
+    """
+    monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+
+    async def _slug(ws):
+        return "org/repo"
+
+    monkeypatch.setattr(communication_tools, "_gh_repo_slug", _slug)
+    client = _FakeGhClient(response)
+    monkeypatch.setattr(communication_tools, "_get_gh_client", lambda: client)
+    return client
+
+
+class TestGhRestPath:
+    async def test_read_uses_rest(self, monkeypatch):
+        client = _install_rest(monkeypatch, _FakeGhResponse([
+            {"user": {"login": "reviewer"}, "body": "LGTM",
+             "created_at": "2026-01-01T00:00:00Z"}
+        ]))
+
+        result = await read_pr_comments(42)
+        assert result["status"] == "ok"
+        assert result["comments"][0]["author"] == "reviewer"
+        assert result["comments"][0]["body"] == "LGTM"
+
+        method, url, kwargs = client.calls[0]
+        assert method == "GET"
+        assert "repos/org/repo/issues/42/comments" in url
+        assert kwargs["headers"]["Authorization"] == "Bearer test-token"
+
+    async def test_reply_posts_via_rest(self, monkeypatch):
+        client = _install_rest(monkeypatch, _FakeGhResponse({}, status_code=201))
+
+        result = await reply_to_pr_comments(42, "Thanks!")
+        assert result["status"] == "ok"
+
+        method, _, kwargs = client.calls[0]
+        assert method == "POST"
+        assert kwargs["json"] == {"body": "Thanks!"}
+
+    @patch.object(communication_tools.subprocess, "run")
+    async def test_rest_error_falls_back_to_gh(self, mock_run, monkeypatch):
+        _install_rest(monkeypatch, _FakeGhResponse({}, status_code=500))
+        mock_run.return_value = _gh_proc(stdout=_COMMENTS_JSON_BYTES)
+
+        result = await read_pr_comments(42)
+        assert result["status"] == "ok"
+        assert result["total_comments"] == 1
+        mock_run.assert_called_once()
+
@@ -11,14 +11,20 @@ Usage:
 """
 
 import os
-import sys
+import re
+import collections
 import subprocess
 import asyncio
+from pathlib import Path
+from types import MappingProxyType
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
-from dotenv import load_dotenv
-load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
+# Only touch the filesystem for .env when the key is actually missing —
+# collection of this (normally deselected) module should do zero IO.
+if not os.environ.get("GOOGLE_API_KEY"):
+    _env_path = os.path.join(os.path.dirname(__file__), "..", ".env")
+    if os.path.exists(_env_path):
+        from dotenv import load_dotenv
+        load_dotenv(_env_path)
 
 import pytest
 from google.adk.runners import Runner
@@ -36,6 +42,31 @@ REPO_URL = "https://github.com/sairamcharan9/calculator-app-assignment5"
 
 TASK = "Add a square root function to the calculator app"
 
+# Transient-error signatures worth retrying (mirrors worker/main.py)
+_RATE_LIMIT_RE = re.compile(
+    r"429|resource exhausted|rate limit|quota|unavailable|overloaded|try again"
+)
+
+# Read-only template for the per-test session state (copy with dict(...))
+_INITIAL_STATE = MappingProxyType({
+    "automation_mode": "AUTO_APPROVE",
+    "plan": [],
+    "current_step": 0,
+    "completed_steps": [],
+    "approved": False,
+    "awaiting_approval": False,
+    "submitted": False,
+    "commit_message": "",
+    "task_complete": False,
+    "final_summary": "",
+    "messages": [],
+    "typed_messages": [],
+    "awaiting_user_input": False,
+    "user_input_prompt": "",
+    "pr_url": "",
+    "pr_number": 0,
+})
+
 # Skip the entire module if no API key is set, AND mark as e2e so it's
 # excluded from normal test runs.  Run explicitly with: pytest -m e2e
 pytestmark = [
@@ -52,21 +83,52 @@ pytestmark = [
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(scope="session")
+def _repo_mirror(tmp_path_factory):
+    """Bare mirror of the calculator repo — one network clone per session."""
+    mirror = str(tmp_path_factory.mktemp("mirror") / "repo.git")
+
+    result = subprocess.run(
+        ["git", "clone", "--mirror", REPO_URL, mirror],
+        capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, f"Mirror clone failed: {result.stderr}"
+    return mirror
+
+
 @pytest.fixture
-def workspace(tmp_path):
-    """Clone the calculator repo into a temporary workspace."""
+def workspace(tmp_path, _repo_mirror, request):
+    """Materialize a fresh workspace from the session mirror (no network)."""
     ws = str(tmp_path / "workspace")
 
     result = subprocess.run(
-        ["git", "clone", "--depth", "1", REPO_URL, ws],
-        capture_output=True, text=True, timeout=60,
+        ["git", "worktree", "add", "--detach", ws, "HEAD"],
+        capture_output=True, text=True, cwd=_repo_mirror, timeout=60,
     )
-    assert result.returncode == 0, f"Clone failed: {result.stderr}"
-    print(f"\n📁 Cloned repo into {ws}")
+    assert result.returncode == 0, f"Worktree add failed: {result.stderr}"
+    print(f"\n📁 Created workspace at {ws}")
 
+    def _cleanup():
+        subprocess.run(
+            ["git", "worktree", "remove", "--force", ws],
+            capture_output=True, cwd=_repo_mirror,
+        )
+
+    request.addfinalizer(_cleanup)
     return ws
 
 
+@pytest.fixture(scope="session")
+def agent():
+    """One agent per session — construction imports the LLM client stack."""
+    return create_agent()
+
+
+@pytest.fixture(scope="session")
+def session_service():
+    return InMemorySessionService()
+
+
 # ---------------------------------------------------------------------------
 # E2E Test
 # ---------------------------------------------------------------------------
@@ -75,13 +137,11 @@ def workspace(tmp_path):
 class TestE2EAgent:
     """Run the agent against the calculator repo and verify it completes."""
 
-    async def test_adds_sqrt_to_calculator(self, workspace, monkeypatch):
+    async def test_adds_sqrt_to_calculator(self, workspace, agent, session_service, monkeypatch):
         """Agent should orient, plan, write code, run tests, and commit."""
         monkeypatch.setenv("WORKSPACE_ROOT", workspace)
 
-        # --- Setup agent + runner ---
-        agent = create_agent()
-        session_service = InMemorySessionService()
+        # --- Setup runner (agent + session service are session-scoped) ---
         runner = Runner(
             agent=agent,
             app_name="forge-e2e",
@@ -91,24 +151,7 @@ class TestE2EAgent:
         session = await session_service.create_session(
             app_name="forge-e2e",
             user_id="test-user",
-            state={
-                "automation_mode": "AUTO_APPROVE",
-                "plan": [],
-                "current_step": 0,
-                "completed_steps": [],
-                "approved": False,
-                "awaiting_approval": False,
-                "submitted": False,
-                "commit_message": "",
-                "task_complete": False,
-                "final_summary": "",
-                "messages": [],
-                "typed_messages": [],
-                "awaiting_user_input": False,
-                "user_input_prompt": "",
-                "pr_url": "",
-                "pr_number": 0,
-            },
+            state=dict(_INITIAL_STATE),
         )
 
         # --- Run the agent (with retry for rate limits) ---
@@ -118,7 +161,9 @@ class TestE2EAgent:
             "Auto-approve the plan without waiting for user review.]"
         ))])
 
-        events = []
+        # Keep only the tail of the event stream for failure diagnostics —
+        # retaining all 80 turns of Content payloads costs tens of MB.
+        recent_events = collections.deque(maxlen=10)
         tool_calls = []
         max_turns = 80  # generous limit for full e2e
 
@@ -137,19 +182,29 @@ class TestE2EAgent:
                     user_id="test-user",
                     new_message=user_message,
                 ):
-                    events.append(event)
+                    recent_events.append(event)
                     turn += 1
 
-                    if hasattr(event, "content") and event.content and event.content.parts:
-                        for part in event.content.parts:
-                            if hasattr(part, "text") and part.text:
-                                print(f"\n[Turn {turn}] {part.text[:300]}")
-                            if hasattr(part, "function_call") and part.function_call:
-                                name = part.function_call.name
-                                tool_calls.append(name)
-                                print(f"  🔧 {name}({str(part.function_call.args)[:120]})")
-                            if hasattr(part, "function_response") and part.function_response:
-                                print(f"  📋 {str(part.function_response.response)[:200]}")
+                    # getattr with a default beats hasattr probing here, and
+                    # empty events (common in a streaming run) short-circuit.
+                    content = getattr(event, "content", None)
+                    if content is None or not content.parts:
+                        if turn >= max_turns:
+                            print(f"\n⚠️ Safety limit reached ({max_turns} turns)")
+                            break
+                        continue
+
+                    for part in content.parts:
+                        text = getattr(part, "text", None)
+                        if text:
+                            print(f"\n[Turn {turn}] {text[:300]}")
+                        fc = getattr(part, "function_call", None)
+                        if fc:
+                            tool_calls.append(fc.name)
+                            print(f"  🔧 {fc.name}({str(fc.args)[:120]})")
+                        fr = getattr(part, "function_response", None)
+                        if fr:
+                            print(f"  📋 {str(fr.response)[:200]}")
 
                     if turn >= max_turns:
                         print(f"\n⚠️ Safety limit reached ({max_turns} turns)")
@@ -160,15 +215,7 @@ class TestE2EAgent:
 
             except Exception as exc:
                 exc_str = str(exc).lower()
-                is_rate_limit = (
-                    "429" in exc_str
-                    or "resource exhausted" in exc_str
-                    or "rate limit" in exc_str
-                    or "quota" in exc_str
-                    or "unavailable" in exc_str
-                    or "overloaded" in exc_str
-                    or "try again" in exc_str
-                )
+                is_rate_limit = bool(_RATE_LIMIT_RE.search(exc_str))
                 if is_rate_limit and attempt < max_retries:
                     wait = retry_delay * (2 ** attempt)
                     print(f"\n⚠️ Rate limited (attempt {attempt + 1}/{max_retries}). Retrying in {wait}s...")
@@ -202,19 +249,17 @@ class TestE2EAgent:
         )
 
         # Verify sqrt was actually added to operations.py
-        ops_path = os.path.join(workspace, "app", "operations.py")
-        assert os.path.isfile(ops_path), "app/operations.py not found"
-        ops_content = open(ops_path).read()
-        assert "sqrt" in ops_content, (
+        ops_path = Path(workspace) / "app" / "operations.py"
+        assert ops_path.is_file(), "app/operations.py not found"
+        assert "sqrt" in ops_path.read_text(), (
             "sqrt not found in app/operations.py — agent failed to add it"
         )
         print(f"\n✅ app/operations.py contains 'sqrt'")
 
         # Verify tests were updated
-        test_ops = os.path.join(workspace, "tests", "test_operations.py")
-        if os.path.isfile(test_ops):
-            test_content = open(test_ops).read()
-            if "sqrt" in test_content:
+        test_ops = Path(workspace) / "tests" / "test_operations.py"
+        if test_ops.is_file():
+            if "sqrt" in test_ops.read_text():
                 print("✅ tests/test_operations.py contains sqrt tests")
             else:
                 print("⚠️ tests/test_operations.py exists but no sqrt tests")
@@ -223,12 +268,13 @@ class TestE2EAgent:
         if "run_in_bash_session" in tool_calls:
             print("✅ Agent ran tests via run_in_bash_session")
 
-        # Check if agent committed
-        git_result = subprocess.run(
-            ["git", "log", "--oneline", "-3"],
-            capture_output=True, text=True, cwd=workspace,
-        )
-        print(f"\n📝 Git log:\n{git_result.stdout}")
+        # Check if agent committed — fork git only when verbose output is wanted
+        if os.environ.get("FORGE_E2E_VERBOSE"):
+            git_result = subprocess.run(
+                ["git", "log", "--oneline", "-3"],
+                capture_output=True, text=True, cwd=workspace,
+            )
+            print(f"\n📝 Git log:\n{git_result.stdout}")
 
         # If agent called done(), task_complete should be True
         if "done" in tool_calls:
@@ -1,11 +1,9 @@
 """Tests for tools/file_tools.py — all 8 file tools (async)."""
 
 import os
+import shutil
 import subprocess
-
-# Allow imports from project root
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from pathlib import Path
 
 from tools.file_tools import (
     list_files,
@@ -20,6 +18,12 @@ from tools.file_tools import (
 
 import pytest
 
+# Evaluated once at import — git-dependent classes skip cleanly when the
+# binary is missing instead of failing one by one inside subprocess calls.
+requires_git = pytest.mark.skipif(
+    shutil.which("git") is None, reason="git executable required"
+)
+
 
 # ---------------------------------------------------------------------------
 # Fixtures
@@ -30,27 +34,44 @@ import pytest
 def workspace(tmp_path):
     """Create a temporary workspace with sample files."""
     # Create a simple file structure
+    # write_bytes: ASCII payloads skip the TextIOWrapper/codec machinery
     (tmp_path / "src").mkdir()
-    (tmp_path / "src" / "main.py").write_text("print('hello')\n", encoding="utf-8")
-    (tmp_path / "src" / "utils.py").write_text("def add(a, b):\n    return a + b\n", encoding="utf-8")
-    (tmp_path / "README.md").write_text("# My Project\n", encoding="utf-8")
+    (tmp_path / "src" / "main.py").write_bytes(b"print('hello')\n")
+    (tmp_path / "src" / "utils.py").write_bytes(b"def add(a, b):\n    return a + b\n")
+    (tmp_path / "README.md").write_bytes(b"# My Project\n")
     (tmp_path / "tests").mkdir()
-    (tmp_path / "tests" / "test_main.py").write_text("def test_pass():\n    assert True\n", encoding="utf-8")
+    (tmp_path / "tests" / "test_main.py").write_bytes(b"def test_pass():\n    assert True\n")
     return str(tmp_path)
 
 
-@pytest.fixture
-def git_workspace(tmp_path):
-    """Create a workspace that is a git repo for restore/reset tests."""
-    (tmp_path / "file.txt").write_text("original content\n", encoding="utf-8")
+@pytest.fixture(scope="session")
+def _git_template(tmp_path_factory):
+    """Template git repo built once per session — tests copy it, never mutate it."""
+    template = tmp_path_factory.mktemp("git_template") / "repo"
+    template.mkdir()
+    (template / "file.txt").write_bytes(b"original content\n")
 
-    subprocess.run(["git", "init"], cwd=str(tmp_path), capture_output=True)
-    subprocess.run(["git", "config", "user.email", "test@test.com"], cwd=str(tmp_path), capture_output=True)
-    subprocess.run(["git", "config", "user.name", "Test"], cwd=str(tmp_path), capture_output=True)
-    subprocess.run(["git", "add", "."], cwd=str(tmp_path), capture_output=True)
-    subprocess.run(["git", "commit", "-m", "init"], cwd=str(tmp_path), capture_output=True)
+    # One shell spawn instead of five git forks (POSIX; template is session-wide)
+    # stdout goes to DEVNULL (never read); stderr is kept for the check=True error.
+    subprocess.run(
+        ["sh", "-c",
+         "git init -q && git config user.email test@test.com && "
+         "git config user.name Test && git add . && git commit -qm init"],
+        cwd=str(template), check=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
 
-    return str(tmp_path)
+    return template
+
+
+@pytest.fixture
+def git_workspace(tmp_path, _git_template):
+    """Per-test git repo — a tree copy of the session template (no git spawns)."""
+    repo = tmp_path / "repo"
+    # Plain copy, not hardlinks: tests open worktree files with mode "w",
+    # which would truncate a shared inode and corrupt the template.
+    shutil.copytree(_git_template, repo)
+    return str(repo)
 
 
 # ---------------------------------------------------------------------------
@@ -197,17 +218,18 @@ class TestPathTraversal:
 # ---------------------------------------------------------------------------
 
 
+@pytest.mark.integration
+@requires_git
 class TestRestoreFile:
     async def test_restores_modified_file(self, git_workspace):
-        # Modify the committed file
-        with open(os.path.join(git_workspace, "file.txt"), "w") as f:
-            f.write("modified content\n")
+        # Join the path once; pathlib handles open/close in one call
+        target = Path(git_workspace) / "file.txt"
+        target.write_bytes(b"modified content\n")
 
         result = await restore_file("file.txt", workspace=git_workspace)
         assert result["status"] == "ok"
 
-        with open(os.path.join(git_workspace, "file.txt")) as f:
-            assert f.read() == "original content\n"
+        assert target.read_text() == "original content\n"
 
 
 # ---------------------------------------------------------------------------
@@ -215,21 +237,25 @@ class TestRestoreFile:
 # ---------------------------------------------------------------------------
 
 
+@pytest.mark.integration
+@requires_git
 class TestResetAll:
     async def test_resets_workspace(self, git_workspace):
         # Modify the committed file
-        with open(os.path.join(git_workspace, "file.txt"), "w") as f:
-            f.write("modified\n")
+        target = Path(git_workspace) / "file.txt"
+        target.write_bytes(b"modified\n")
 
         # Add a new untracked file should remain after reset --hard
         # but staged files should be reset
-        subprocess.run(["git", "add", "."], cwd=git_workspace, capture_output=True)
+        subprocess.run(
+            ["git", "add", "."], cwd=git_workspace,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
 
         result = await reset_all(workspace=git_workspace)
         assert result["status"] == "ok"
 
-        with open(os.path.join(git_workspace, "file.txt")) as f:
-            assert f.read() == "original content\n"
+        assert target.read_text() == "original content\n"
 
 
 # ---------------------------------------------------------------------------
@@ -237,9 +263,7 @@ class TestResetAll:
 # ---------------------------------------------------------------------------
 
 
-class TestReplaceWithGitMergeDiff:
-    async def test_applies_diff(self, git_workspace):
-        diff = """diff --git a/file.txt b/file.txt
+_SAMPLE_DIFF = """diff --git a/file.txt b/file.txt
 index 1234567..abcdefg 100644
 --- a/file.txt
 +++ b/file.txt
@@ -247,9 +271,13 @@ index 1234567..abcdefg 100644
  original content
 +added line
 """
-        result = await replace_with_git_merge_diff("file.txt", diff, workspace=git_workspace)
+
+
+@pytest.mark.integration
+@requires_git
+class TestReplaceWithGitMergeDiff:
+    async def test_applies_diff(self, git_workspace):
+        result = await replace_with_git_merge_diff("file.txt", _SAMPLE_DIFF, workspace=git_workspace)
         assert result["status"] == "ok"
 
-        with open(os.path.join(git_workspace, "file.txt")) as f:
-            content = f.read()
-            assert "added line" in content
+        assert "added line" in (Path(git_workspace) / "file.txt").read_text()
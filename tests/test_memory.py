@@ -1,10 +1,5 @@
 """Tests for memory/vertex_memory.py — service factory."""
 
-import os
-
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
 from memory.vertex_memory import (
     create_session_service,
     create_memory_service,
@@ -17,36 +12,39 @@ from google.adk.memory import InMemoryMemoryService
 import pytest
 
 
-class TestCreateSessionService:
-    def test_dev_mode_default(self, monkeypatch):
-        monkeypatch.delenv("SERVICE_MODE", raising=False)
-        service = create_session_service()
-        assert isinstance(service, InMemorySessionService)
+# One row per factory scenario: (mode arg, env var to clear, expected type/exc)
+_FACTORY_CASES = [
+    pytest.param(None, "SERVICE_MODE", "dev", id="dev_mode_default"),
+    pytest.param("dev", None, "dev", id="dev_mode_explicit"),
+    pytest.param("prod", "GOOGLE_CLOUD_PROJECT", ValueError, id="prod_mode_missing_project"),
+]
 
-    def test_dev_mode_explicit(self):
-        service = create_session_service(mode="dev")
-        assert isinstance(service, InMemorySessionService)
 
-    def test_prod_mode_missing_project(self, monkeypatch):
-        monkeypatch.delenv("GOOGLE_CLOUD_PROJECT", raising=False)
-        with pytest.raises(ValueError, match="GOOGLE_CLOUD_PROJECT"):
-            create_session_service(mode="prod")
+class TestCreateSessionService:
+    @pytest.mark.parametrize("mode,clear,expect", _FACTORY_CASES)
+    def test_factory(self, monkeypatch, mode, clear, expect):
+        if clear:
+            monkeypatch.delenv(clear, raising=False)
+        if expect is ValueError:
+            # Substring check instead of a regex match= — no re compile/search
+            with pytest.raises(ValueError) as exc:
+                create_session_service(mode=mode)
+            assert "GOOGLE_CLOUD_PROJECT" in str(exc.value)
+        else:
+            assert isinstance(create_session_service(mode=mode), InMemorySessionService)
 
 
 class TestCreateMemoryService:
-    def test_dev_mode_default(self, monkeypatch):
-        monkeypatch.delenv("SERVICE_MODE", raising=False)
-        service = create_memory_service()
-        assert isinstance(service, InMemoryMemoryService)
-
-    def test_dev_mode_explicit(self):
-        service = create_memory_service(mode="dev")
-        assert isinstance(service, InMemoryMemoryService)
-
-    def test_prod_mode_missing_project(self, monkeypatch):
-        monkeypatch.delenv("GOOGLE_CLOUD_PROJECT", raising=False)
-        with pytest.raises(ValueError, match="GOOGLE_CLOUD_PROJECT"):
-            create_memory_service(mode="prod")
+    @pytest.mark.parametrize("mode,clear,expect", _FACTORY_CASES)
+    def test_factory(self, monkeypatch, mode, clear, expect):
+        if clear:
+            monkeypatch.delenv(clear, raising=False)
+        if expect is ValueError:
+            with pytest.raises(ValueError) as exc:
+                create_memory_service(mode=mode)
+            assert "GOOGLE_CLOUD_PROJECT" in str(exc.value)
+        else:
+            assert isinstance(create_memory_service(mode=mode), InMemoryMemoryService)
 
 
 class TestCreateServices:
@@ -1,10 +1,5 @@
 """Tests for tools/planning_tools.py — all 6 planning tools (async)."""
 
-import os
-
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
 from tools.planning_tools import (
     set_plan,
     plan_step_complete,
@@ -23,17 +18,38 @@ import pytest
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def ctx():
-    """Fresh MockToolContext with empty state."""
+    """Shared MockToolContext — state is wiped between tests by _reset_ctx."""
     return MockToolContext()
 
 
+@pytest.fixture(autouse=True)
+def _reset_ctx(ctx):
+    yield
+    ctx.state.clear()
+
+
+@pytest.fixture(scope="session")
+def _plan_state_template():
+    """State with a plan already set — built once, deep-copied per test."""
+    import asyncio
+
+    async def _build():
+        tc = MockToolContext()
+        await set_plan(["Step 1: Read code", "Step 2: Write code", "Step 3: Test"], tc)
+        return tc.state
+
+    return asyncio.run(_build())
+
+
 @pytest.fixture
-async def ctx_with_plan():
+def ctx_with_plan(_plan_state_template):
     """ToolContext that already has a plan set."""
+    import copy
+
     tc = MockToolContext()
-    await set_plan(["Step 1: Read code", "Step 2: Write code", "Step 3: Test"], tc)
+    tc.state = copy.deepcopy(_plan_state_template)
     return tc
 
 
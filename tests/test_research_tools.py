@@ -4,17 +4,51 @@ All HTTP calls are mocked — no API keys or network access required.
 """
 
 import os
-from unittest.mock import AsyncMock, patch, MagicMock
-
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+import tools.research_tools as research_tools
 from tools.research_tools import view_text_website, view_image, read_image_file
 
 import pytest
 import httpx
 
 
+# ---------------------------------------------------------------------------
+# Fake HTTP client — plain classes instead of AsyncMock: no unittest.mock
+# reflection per test, and the wiring lives in one place. The tools fetch
+# through the shared research_tools._get_client(), so that is the patch
+# target.
+# ---------------------------------------------------------------------------
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, text=None, content=None, headers=None):
+        self.text = text
+        self.content = content
+        self.headers = headers if headers is not None else {}
+
+    def raise_for_status(self):
+        pass
+
+
+class _FakeClient:
+    def __init__(self, response=None, error=None):
+        self._response = response
+        self._error = error
+
+    async def get(self, *args, **kwargs):
+        if self._error is not None:
+            raise self._error
+        return self._response
+
+
+def _install_client(monkeypatch, response=None, error=None):
+    client = _FakeClient(response=response, error=error)
+    monkeypatch.setattr(research_tools, "_get_client", lambda: client)
+    return client
+
+
 # ---------------------------------------------------------------------------
 # view_text_website
 # ---------------------------------------------------------------------------
@@ -30,78 +64,61 @@ class TestViewTextWebsite:
         assert "error" in result
         assert "http" in result["error"]
 
-    @patch("tools.research_tools.httpx.AsyncClient")
-    async def test_successful_fetch(self, mock_client_cls):
+    async def test_successful_fetch(self, monkeypatch):
         html = "<html><head><title>Test Page</title></head><body><p>Hello World</p></body></html>"
-
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status = MagicMock()
-        mock_response.text = html
-        mock_response.headers = {"content-type": "text/html; charset=utf-8"}
-
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(return_value=mock_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
+        _install_client(monkeypatch, _FakeResponse(
+            text=html, headers={"content-type": "text/html; charset=utf-8"}
+        ))
 
         result = await view_text_website("https://example.com")
         assert result["title"] == "Test Page"
         assert "Hello World" in result["content"]
         assert result["url"] == "https://example.com"
 
-    @patch("tools.research_tools.httpx.AsyncClient")
-    async def test_strips_scripts(self, mock_client_cls):
+    async def test_strips_scripts(self, monkeypatch):
         html = "<html><body><script>alert('xss')</script><p>Safe content</p></body></html>"
-
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status = MagicMock()
-        mock_response.text = html
-        mock_response.headers = {"content-type": "text/html"}
-
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(return_value=mock_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
+        _install_client(monkeypatch, _FakeResponse(
+            text=html, headers={"content-type": "text/html"}
+        ))
 
         result = await view_text_website("https://example.com")
         assert "alert" not in result["content"]
         assert "Safe content" in result["content"]
 
-    @patch("tools.research_tools.httpx.AsyncClient")
-    async def test_truncates_large_response(self, mock_client_cls):
+    async def test_truncates_large_response(self, monkeypatch):
         html = "<html><body>" + "x" * 60_000 + "</body></html>"
-
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status = MagicMock()
-        mock_response.text = html
-        mock_response.headers = {"content-type": "text/html"}
-
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(return_value=mock_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
+        _install_client(monkeypatch, _FakeResponse(
+            text=html, headers={"content-type": "text/html"}
+        ))
 
         result = await view_text_website("https://example.com")
         assert "truncated" in result["content"]
 
-    @patch("tools.research_tools.httpx.AsyncClient")
-    async def test_timeout(self, mock_client_cls):
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(side_effect=httpx.TimeoutException("timeout"))
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
+    async def test_timeout(self, monkeypatch):
+        _install_client(monkeypatch, error=httpx.TimeoutException("timeout"))
 
         result = await view_text_website("https://example.com")
         assert "error" in result
         assert "timed out" in result["error"]
 
+    async def test_304_returns_cached_result(self, monkeypatch):
+        monkeypatch.setattr(research_tools, "_URL_CACHE", {})
+        html = "<html><head><title>Cached</title></head><body><p>Body</p></body></html>"
+        client = _install_client(monkeypatch, _FakeResponse(
+            text=html, headers={"content-type": "text/html", "etag": '"abc123"'}
+        ))
+
+        first = await view_text_website("https://example.com/page")
+        assert first["title"] == "Cached"
+
+        # Second fetch: server says Not Modified — cached parse comes back
+        not_modified = _FakeResponse(headers={})
+        not_modified.status_code = 304
+        client._response = not_modified
+
+        second = await view_text_website("https://example.com/page")
+        assert second == first
+
 
 # ---------------------------------------------------------------------------
 # view_image
@@ -118,19 +135,10 @@ class TestViewImage:
         assert "error" in result
         assert "http" in result["error"]
 
-    @patch("tools.research_tools.httpx.AsyncClient")
-    async def test_successful_fetch(self, mock_client_cls):
-        mock_response = AsyncMock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status = MagicMock()
-        mock_response.content = b"fake image content"
-        mock_response.headers = {"content-type": "image/jpeg"}
-
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(return_value=mock_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
+    async def test_successful_fetch(self, monkeypatch):
+        _install_client(monkeypatch, _FakeResponse(
+            content=b"fake image content", headers={"content-type": "image/jpeg"}
+        ))
 
         result = await view_image("https://example.com/img.jpg")
         assert result["status"] == "ok"
@@ -138,18 +146,20 @@ class TestViewImage:
         assert "base64" in result
         assert result["mime_type"] == "image/jpeg"
 
-    @patch("tools.research_tools.httpx.AsyncClient")
-    async def test_oversized_image(self, mock_client_cls):
-        mock_response = AsyncMock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status = MagicMock()
-        mock_response.content = b"0" * (11 * 1024 * 1024)
-
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(return_value=mock_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
-        mock_client_cls.return_value = mock_client
+    async def test_return_format_data_uri(self, monkeypatch):
+        _install_client(monkeypatch, _FakeResponse(
+            content=b"raw payload", headers={"content-type": "image/png"}
+        ))
+
+        result = await view_image("https://example.com/img.png", return_format="data_uri")
+        assert result["data_uri"].startswith("data:image/png;base64,")
+
+    async def test_unknown_return_format(self):
+        result = await view_image("https://example.com/img.png", return_format="hex")
+        assert "error" in result
+
+    async def test_oversized_image(self, monkeypatch):
+        _install_client(monkeypatch, _FakeResponse(content=b"0" * (11 * 1024 * 1024)))
 
         result = await view_image("https://example.com/huge.png")
         assert "error" in result
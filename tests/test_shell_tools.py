@@ -3,9 +3,6 @@
 import os
 import base64
 
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
 from tools.shell_tools import (
     run_in_bash_session,
     frontend_verification_instructions,
@@ -88,6 +85,23 @@ class TestRunInBashSession:
         assert "line1" in result["stdout"]
         assert "line2" in result["stdout"]
 
+    async def test_stdin_reader_gets_eof(self, workspace):
+        # A command reading stdin must see EOF immediately instead of
+        # consuming the session's sentinel lines (and hanging until timeout).
+        result = await run_in_bash_session("cat", workspace=workspace)
+        assert result["exit_code"] == 0
+        assert result["stdout"] == ""
+
+    async def test_partial_stdin_reader(self, workspace):
+        # `head -1` reads one line then exits — it must not echo a stolen
+        # sentinel into stdout or corrupt the session for the next command.
+        result = await run_in_bash_session("head -1", workspace=workspace)
+        assert result["exit_code"] == 0
+        assert result["stdout"] == ""
+        follow_up = await run_in_bash_session("echo after", workspace=workspace)
+        assert follow_up["exit_code"] == 0
+        assert "after" in follow_up["stdout"]
+
 
 # ---------------------------------------------------------------------------
 # frontend_verification_instructions
@@ -12,29 +12,140 @@ All tools are async for ADK parallelisation.
 import os
 import re
 import asyncio
+import atexit
 import subprocess
 
+import httpx
 from google.adk.tools import ToolContext
 from utils.workspace_utils import get_workspace
 
 
+# Soft dependency: orjson parses bytes directly (no intermediate str)
+# and is several times faster on large comment threads. Both loaders
+# accept bytes and raise a ValueError subclass on bad input.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 
+_GH_API = "https://api.github.com"
 
-async def _run_git(args: list[str], cwd: str, timeout: int = 30) -> tuple[int, str, str]:
-    """Run a git/gh command and return (returncode, stdout, stderr)."""
+# owner/repo extracted from either SSH or HTTPS remote URLs
+_REMOTE_SLUG_RE = re.compile(r"github\.com[:/]([^/\s]+/[^/\s]+?)(?:\.git)?$")
+
+# PR number extracted from the URL gh pr create prints
+_PR_URL_RE = re.compile(r"/pull/(\d+)")
+
+# Workspace -> owner/repo; the origin remote doesn't change mid-session
+_REPO_SLUG_CACHE: dict = {}
+
+# Shared GitHub API client — built lazily; one pooled client keeps the
+# TLS connection to api.github.com alive across PR tool calls instead of
+# handshaking on every request.
+_GH_CLIENT: httpx.AsyncClient = None
+
+
+def _get_gh_client() -> httpx.AsyncClient:
+    """Return the shared GitHub client, creating it on first use."""
+    global _GH_CLIENT
+    if _GH_CLIENT is None or _GH_CLIENT.is_closed:
+        _GH_CLIENT = httpx.AsyncClient(
+            timeout=30,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            headers={
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+            },
+        )
+    return _GH_CLIENT
+
+
+def _close_gh_client() -> None:
+    """Close the shared client at interpreter exit (best effort)."""
+    global _GH_CLIENT
+    if _GH_CLIENT is not None and not _GH_CLIENT.is_closed:
+        try:
+            asyncio.run(_GH_CLIENT.aclose())
+        except RuntimeError:
+            pass  # a loop is still running — connections die with the process
+    _GH_CLIENT = None
+
+
+atexit.register(_close_gh_client)
+
+
+async def _gh_repo_slug(ws: str) -> str:
+    """Return "owner/repo" parsed from the origin remote, or "" if
+    unavailable. Successful lookups are cached per workspace."""
+    slug = _REPO_SLUG_CACHE.get(ws)
+    if slug:
+        return slug
     try:
-        proc = await asyncio.to_thread(
-            subprocess.run,
-            args,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            cwd=cwd,
-            timeout=timeout,
+        rc, out, _ = await _run_git(
+            ["git", "config", "--get", "remote.origin.url"], ws, timeout=10
         )
-        return proc.returncode, proc.stdout.decode().strip(), proc.stderr.decode().strip()
-    except subprocess.TimeoutExpired:
+    except (FileNotFoundError, asyncio.TimeoutError):
+        return ""
+    if rc != 0:
+        return ""
+    match = _REMOTE_SLUG_RE.search(out)
+    if not match:
+        return ""
+    _REPO_SLUG_CACHE[ws] = match.group(1)
+    return match.group(1)
+
+
+async def _gh_api(method: str, path: str, ws: str, payload: dict = None):
+    """Call the GitHub REST API directly, skipping the gh CLI fork.
+
+    ``path`` is relative to the repo, e.g. "issues/42/comments". Returns
+    parsed JSON on success, or None when the direct path is unavailable
+    (no GITHUB_TOKEN, unparseable origin remote, HTTP or network error)
+    so callers can fall back to the gh CLI.
+    """
+    token = os.environ.get("GITHUB_TOKEN")
+    if not token:
+        return None
+    slug = await _gh_repo_slug(ws)
+    if not slug:
+        return None
+    try:
+        resp = await _get_gh_client().request(
+            method, f"{_GH_API}/repos/{slug}/{path}",
+            headers={"Authorization": f"Bearer {token}"},
+            json=payload,
+        )
+    except httpx.HTTPError:
+        return None
+    if resp.status_code >= 400:
+        return None
+    return resp.json() if resp.content else {}
+
+
+
+
+
+async def _run_git(args: list[str], cwd: str, timeout: int = 30) -> tuple[int, str, str]:
+    """Run a git/gh command and return (returncode, stdout, stderr).
+
+    Uses the event loop's own subprocess support — no worker thread is
+    tied up for the duration of the command, and several commands can be
+    awaited concurrently.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.communicate()
         raise asyncio.TimeoutError(f"Command {' '.join(args)} timed out after {timeout}s")
+    return proc.returncode, stdout.decode().strip(), stderr.decode().strip()
 
 
 async def message_user(message: str, tool_context: ToolContext) -> dict:
@@ -46,12 +157,15 @@ async def message_user(message: str, tool_context: ToolContext) -> dict:
     if not message or not message.strip():
         return {"error": "Message must not be empty"}
 
-    messages = tool_context.state.get("messages", [])
+    # Append in place; the rebind below is required — ADK only records a
+    # state delta on assignment, so dropping it would lose the message in
+    # production even though the list itself mutated.
+    messages = tool_context.state.setdefault("messages", [])
     messages.append(message)
     tool_context.state["messages"] = messages
-    
+
     # Also append to typed_messages for UI stream visibility
-    typed_messages = tool_context.state.get("typed_messages", [])
+    typed_messages = tool_context.state.setdefault("typed_messages", [])
     typed_messages.append({"role": "assistant", "content": message})
     tool_context.state["typed_messages"] = typed_messages
 
@@ -149,12 +263,11 @@ async def submit(commit_message: str, branch_name: str, pr_title: str, tool_cont
                 return {"error": "Nothing to commit — working tree is clean. Make changes before submitting."}
             return {"error": f"git commit failed: {err}"}
 
-        # 4. Get commit SHA
-        rc, sha, _ = await _run_git(["git", "rev-parse", "HEAD"], ws, timeout=10)
-
-        # 5. Push to remote
-        rc, out, err = await _run_git(
-            ["git", "push", "-u", "origin", full_branch_name], ws, timeout=60
+        # 4+5. SHA read and push are independent once the commit exists,
+        # so overlap the local rev-parse with the network-bound push.
+        (_, sha, _), (rc, out, err) = await asyncio.gather(
+            _run_git(["git", "rev-parse", "HEAD"], ws, timeout=10),
+            _run_git(["git", "push", "-u", "origin", full_branch_name], ws, timeout=60),
         )
         if rc != 0:
             # Push failed — still record the commit but report the push error
@@ -179,7 +292,7 @@ async def submit(commit_message: str, branch_name: str, pr_title: str, tool_cont
         )
         if rc == 0:
             pr_url = out
-            match = re.search(r"/pull/(\d+)", pr_url)
+            match = _PR_URL_RE.search(pr_url)
             if match:
                 pr_number = int(match.group(1))
         else:
@@ -243,16 +356,35 @@ async def done(summary: str, tool_context: ToolContext) -> dict:
 async def read_pr_comments(
     pr_number: int, tool_context: ToolContext = None, workspace: str = ""
 ) -> dict:
-    """Fetch comments on a GitHub PR using the ``gh`` CLI.
+    """Fetch comments on a GitHub PR.
 
-    Runs ``gh pr view <number> --comments --json comments`` and returns
-    the parsed comment list with author, body, and createdAt fields.
+    Talks to the GitHub REST API directly when GITHUB_TOKEN is set
+    (no gh process fork); otherwise runs
+    ``gh pr view <number> --comments --json comments``. Returns the
+    parsed comment list with author, body, and createdAt fields.
     """
     if not isinstance(pr_number, int) or pr_number <= 0:
         return {"error": f"Invalid PR number: {pr_number}"}
 
     ws = workspace or get_workspace(tool_context)
 
+    api_data = await _gh_api("GET", f"issues/{pr_number}/comments", ws)
+    if api_data is not None:
+        comments = [
+            {
+                "author": c.get("user", {}).get("login", "unknown"),
+                "body": c.get("body", ""),
+                "createdAt": c.get("created_at", ""),
+            }
+            for c in api_data
+        ]
+        return {
+            "status": "ok",
+            "pr_number": pr_number,
+            "comments": comments,
+            "total_comments": len(comments),
+        }
+
     try:
         proc = await asyncio.to_thread(
             subprocess.run,
@@ -266,16 +398,15 @@ async def read_pr_comments(
         if proc.returncode != 0:
             return {"error": f"gh pr view failed: {proc.stderr.decode().strip()}"}
 
-        stdout_decoded = proc.stdout.decode()
+        stdout_bytes = proc.stdout
     except FileNotFoundError:
         return {"error": "'gh' CLI not found on system. Install GitHub CLI."}
     except subprocess.TimeoutExpired:
         return {"error": "gh pr view timed out"}
 
-    import json
     try:
-        data = json.loads(stdout_decoded)
-    except json.JSONDecodeError:
+        data = _json_loads(stdout_bytes)
+    except ValueError:
         return {"error": "Failed to parse gh output as JSON"}
 
     comments = []
@@ -297,9 +428,10 @@ async def read_pr_comments(
 async def reply_to_pr_comments(
     pr_number: int, body: str, tool_context: ToolContext = None, workspace: str = ""
 ) -> dict:
-    """Post a comment on a GitHub PR using the ``gh`` CLI.
+    """Post a comment on a GitHub PR.
 
-    Runs ``gh pr comment <number> --body "<body>"``.
+    Posts via the GitHub REST API when GITHUB_TOKEN is set; otherwise
+    runs ``gh pr comment <number> --body "<body>"``.
     """
     if not isinstance(pr_number, int) or pr_number <= 0:
         return {"error": f"Invalid PR number: {pr_number}"}
@@ -309,6 +441,15 @@ async def reply_to_pr_comments(
 
     ws = workspace or get_workspace(tool_context)
 
+    api_data = await _gh_api("POST", f"issues/{pr_number}/comments", ws, payload={"body": body})
+    if api_data is not None:
+        return {
+            "status": "ok",
+            "pr_number": pr_number,
+            "body": body,
+            "message": f"Comment posted on PR #{pr_number}.",
+        }
+
     try:
         proc = await asyncio.to_thread(
             subprocess.run,
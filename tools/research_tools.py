@@ -10,11 +10,14 @@ All tools are async for ADK parallelisation.
 """
 
 import asyncio
+import atexit
 import base64
+import mmap
 import os
+import re
+import stat
 from urllib.parse import urlparse
 
-import aiofiles
 import httpx
 from bs4 import BeautifulSoup
 from google.adk.tools import ToolContext
@@ -26,6 +29,101 @@ WORKSPACE_ROOT = os.environ.get("WORKSPACE_ROOT", "/workspace")
 # Max response size for view_text_website — 50KB of text
 MAX_TEXT_BYTES = 50_000
 
+# Pre-parse budget — HTML beyond this is dropped before DOM construction,
+# since the extracted text is capped at MAX_TEXT_BYTES anyway.
+MAX_PARSE_CHARS = 2_000_000
+
+# Compiled once — URL scheme validation runs on every fetch tool call
+_URL_RE = re.compile(r"^https?://")
+
+# Supported image extensions and their MIME types
+_EXT_MIME = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".bmp": "image/bmp",
+    ".svg": "image/svg+xml",
+}
+
+# Prefer the lxml C parser (5-10x faster on large pages); fall back to the
+# stdlib parser when lxml isn't installed.
+try:
+    import lxml  # noqa: F401
+
+    _HTML_PARSER = "lxml"
+except ImportError:
+    _HTML_PARSER = "html.parser"
+
+# Soft dependency: pybase64's SIMD encoder runs ~10x faster than the
+# stdlib on multi-MB images and skips the separate .decode("ascii").
+try:
+    from pybase64 import b64encode_as_string as _b64encode_str
+except ImportError:
+    def _b64encode_str(data) -> str:
+        return base64.b64encode(data).decode("ascii")
+
+# Advertise brotli only when a decoder is importable — httpx raises
+# DecodingError on a br response it can't decode.
+try:
+    import brotli  # noqa: F401
+
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
+# Soft dependency: selectolax (Modest engine) extracts title + text
+# without building a Python node per element, which beats even lxml on
+# large pages. BeautifulSoup remains the fallback.
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxHTML
+except ImportError:
+    _SelectolaxHTML = None
+
+
+# Shared HTTP client — built lazily so importing the module stays cheap.
+# Reusing one client keeps TCP/TLS connections alive across tool calls
+# instead of handshaking on every fetch.
+_CLIENT: httpx.AsyncClient = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            timeout=30,
+            follow_redirects=True,
+            headers={
+                "User-Agent": "Mozilla/5.0 (compatible; ForgeBot/1.0)",
+                "Accept-Encoding": _ACCEPT_ENCODING,
+            },
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
+    return _CLIENT
+
+
+def _close_client() -> None:
+    """Close the shared client at interpreter exit (best effort)."""
+    global _CLIENT
+    if _CLIENT is not None and not _CLIENT.is_closed:
+        try:
+            asyncio.run(_CLIENT.aclose())
+        except RuntimeError:
+            pass  # a loop is still running — connections die with the process
+    _CLIENT = None
+
+
+atexit.register(_close_client)
+
+
+# Conditional-request cache for view_text_website — URL -> (etag,
+# last-modified, parsed result). A 304 revalidation skips both the body
+# transfer and the HTML parse. Insertion-ordered dict gives FIFO eviction.
+_URL_CACHE: dict = {}
+_URL_CACHE_MAX = 256
+
 
 
 async def view_text_website(
@@ -41,17 +139,23 @@ async def view_text_website(
     if not url or not url.strip():
         return {"error": "URL must not be empty"}
 
-    if not url.startswith(("http://", "https://")):
+    if not _URL_RE.match(url):
         return {"error": "URL must start with http:// or https://"}
 
+    cached = _URL_CACHE.get(url)
+    cond_headers = {}
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            cond_headers["If-None-Match"] = etag
+        if last_modified:
+            cond_headers["If-Modified-Since"] = last_modified
+
     try:
-        async with httpx.AsyncClient(
-            timeout=30,
-            follow_redirects=True,
-            headers={"User-Agent": "Mozilla/5.0 (compatible; ForgeBot/1.0)"},
-        ) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
+        resp = await _get_client().get(url, headers=cond_headers or None)
+        if cached and resp.status_code == 304:
+            return cached[2]
+        resp.raise_for_status()
     except httpx.TimeoutException:
         return {"error": f"Request to {url} timed out"}
     except httpx.HTTPStatusError as exc:
@@ -60,29 +164,75 @@ async def view_text_website(
         return {"error": f"Failed to fetch {url}: {str(exc)}"}
 
     content_type = resp.headers.get("content-type", "")
+    # Cut oversized bodies before parsing — no point building DOM nodes
+    # for content that the MAX_TEXT_BYTES cap below would discard.
+    body = resp.text[:MAX_PARSE_CHARS]
     if "text/html" in content_type:
-        soup = BeautifulSoup(resp.text, "html.parser")
-        # Remove script and style elements
-        for tag in soup(["script", "style", "nav", "footer", "header"]):
-            tag.decompose()
-        title = soup.title.string.strip() if soup.title and soup.title.string else ""
-        text = soup.get_text(separator="\n", strip=True)
+        if _SelectolaxHTML is not None:
+            tree = _SelectolaxHTML(body)
+            # Remove script and style elements
+            for node in tree.css("script,style,nav,footer,header"):
+                node.decompose()
+            title_node = tree.css_first("title")
+            title = title_node.text(strip=True) if title_node else ""
+            text = tree.body.text(separator="\n", strip=True) if tree.body else ""
+        else:
+            soup = BeautifulSoup(body, _HTML_PARSER)
+            # Remove script and style elements
+            for tag in soup(["script", "style", "nav", "footer", "header"]):
+                tag.decompose()
+            title = soup.title.string.strip() if soup.title and soup.title.string else ""
+            text = soup.get_text(separator="\n", strip=True)
     else:
         # Plain text or other content — return as-is
         title = ""
-        text = resp.text
+        text = body
 
     # Truncate to prevent oversized responses
     if len(text) > MAX_TEXT_BYTES:
         text = text[:MAX_TEXT_BYTES] + "\n\n[... truncated at 50KB ...]"
 
-    return {
+    result = {
         "content": text,
         "title": title,
         "url": url,
         "content_length": len(text),
     }
 
+    # Only cache responses the server can revalidate
+    etag = resp.headers.get("etag", "")
+    last_modified = resp.headers.get("last-modified", "")
+    if etag or last_modified:
+        if url not in _URL_CACHE and len(_URL_CACHE) >= _URL_CACHE_MAX:
+            _URL_CACHE.pop(next(iter(_URL_CACHE)))
+        _URL_CACHE[url] = (etag, last_modified, result)
+
+    return result
+
+
+def _stat_and_encode(path: str):
+    """Stat and base64-encode a file through one descriptor.
+
+    One os.open covers the existence check, the size check (fstat) and
+    the encode (mmap pages the file straight into the encoder — no full
+    in-memory copy of the raw bytes). Returns (size, b64); b64 is None
+    when the file exceeds the 10MB cap, so oversized files bail without
+    touching their contents.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        st = os.fstat(fd)
+        if not stat.S_ISREG(st.st_mode):
+            raise FileNotFoundError(path)
+        if st.st_size > 10 * 1024 * 1024:
+            return st.st_size, None
+        if st.st_size == 0:
+            return 0, ""  # empty files can't be mmapped
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            return st.st_size, _b64encode_str(mm)
+    finally:
+        os.close(fd)
+
 
 def _resolve_safe_path(relative_path: str, workspace: str = "") -> str:
     """Resolve a path safely within the workspace boundary."""
@@ -95,25 +245,31 @@ def _resolve_safe_path(relative_path: str, workspace: str = "") -> str:
 
 async def view_image(
     url: str,
+    return_format: str = "base64",
     tool_context: ToolContext = None,
     workspace: str = "",
 ) -> dict:
     """Load and analyze an image from a URL.
 
-    Fetches the image and returns a base64 string.
-    Max file size: 10MB.
+    Fetches the image and returns it in the requested format: "base64"
+    (default) or "data_uri" (ready to embed for callers that accept
+    data: URIs). Only JSON-serializable formats are offered — the result
+    dict must round-trip through ADK's FunctionResponse. Max file
+    size: 10MB.
     """
     if not url or not url.strip():
         return {"error": "URL must not be empty"}
 
-    if not url.startswith(("http://", "https://")):
+    if not _URL_RE.match(url):
         return {"error": "URL must start with http:// or https://"}
 
+    if return_format not in ("base64", "data_uri"):
+        return {"error": f"Unknown return_format: {return_format}"}
+
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            raw = resp.content
+        resp = await _get_client().get(url)
+        resp.raise_for_status()
+        raw = resp.content
     except httpx.TimeoutException:
         return {"error": f"Request to {url} timed out"}
     except httpx.HTTPStatusError as exc:
@@ -124,21 +280,27 @@ async def view_image(
     if len(raw) > 10 * 1024 * 1024:
         return {"error": f"Image at URL {url} is too large ({len(raw)} bytes). Max 10MB."}
 
-    try:
-        encoded = base64.b64encode(raw).decode("ascii")
-    except Exception as exc:
-        return {"error": f"Failed to encode image from URL: {str(exc)}"}
-
     content_type = resp.headers.get("content-type", "application/octet-stream")
 
-    return {
+    result = {
         "status": "ok",
         "url": url,
-        "base64": encoded,
         "size_bytes": len(raw),
         "mime_type": content_type,
     }
 
+    try:
+        # Encode off-loop: a 10MB payload would stall the loop for ms
+        encoded = await asyncio.to_thread(_b64encode_str, raw)
+        if return_format == "data_uri":
+            result["data_uri"] = f"data:{content_type};base64,{encoded}"
+        else:
+            result["base64"] = encoded
+    except Exception as exc:
+        return {"error": f"Failed to encode image from URL: {str(exc)}"}
+
+    return result
+
 
 async def read_image_file(
     path: str,
@@ -158,41 +320,26 @@ async def read_image_file(
     except ValueError as exc:
         return {"error": str(exc)}
 
-    if not os.path.isfile(resolved):
-        return {"error": f"File not found: {path}"}
-
-    # Validate extension
-    valid_ext = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp", ".svg")
-    if not path.lower().endswith(valid_ext):
-        return {"error": f"Unsupported image format. Supported: {', '.join(valid_ext)}"}
-
-    # Check file size (max 10MB)
-    size = os.path.getsize(resolved)
-    if size > 10 * 1024 * 1024:
-        return {"error": f"Image too large ({size} bytes). Max 10MB."}
+    # Validate extension before touching the filesystem
+    ext = os.path.splitext(path)[1].lower()
+    mime_type = _EXT_MIME.get(ext)
+    if mime_type is None:
+        return {"error": f"Unsupported image format. Supported: {', '.join(_EXT_MIME)}"}
 
     try:
-        async with aiofiles.open(resolved, "rb") as f:
-            raw = await f.read()
-        encoded = base64.b64encode(raw).decode("ascii")
+        size, encoded = await asyncio.to_thread(_stat_and_encode, resolved)
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return {"error": f"File not found: {path}"}
     except Exception as exc:
         return {"error": f"Failed to read image: {str(exc)}"}
 
-    ext = os.path.splitext(path)[1].lstrip(".").lower()
-    mime_map = {
-        "png": "image/png",
-        "jpg": "image/jpeg",
-        "jpeg": "image/jpeg",
-        "gif": "image/gif",
-        "webp": "image/webp",
-        "bmp": "image/bmp",
-        "svg": "image/svg+xml",
-    }
+    if encoded is None:
+        return {"error": f"Image too large ({size} bytes). Max 10MB."}
 
     return {
         "status": "ok",
         "path": path,
         "base64": encoded,
         "size_bytes": size,
-        "mime_type": mime_map.get(ext, "application/octet-stream"),
+        "mime_type": mime_type,
     }
@@ -9,14 +9,143 @@ All tools are async for ADK parallelisation.
 
 import asyncio
 import base64
+import mmap
 import os
 
 import subprocess
-import aiofiles
 from google.adk.tools import ToolContext
 from utils.workspace_utils import get_workspace
 
 
+WORKSPACE_ROOT = os.environ.get("WORKSPACE_ROOT", "/workspace")
+
+# Soft dependency: pybase64's SIMD encoder beats the stdlib by ~10x on
+# screenshot-sized payloads.
+try:
+    from pybase64 import b64encode_as_string as _b64encode_str
+except ImportError:
+    def _b64encode_str(data) -> str:
+        return base64.b64encode(data).decode("ascii")
+
+
+class _BashSession:
+    """A long-lived bash subprocess bound to one workspace.
+
+    Forking bash per command costs fork+execve+shell init on every call;
+    the most-called tool pays that tax constantly. A persistent session
+    writes each command to the shell's stdin and frames the output with a
+    per-command sentinel, so the process is spawned once and reused.
+    Commands run in a subshell so `exit` (and its status) don't take the
+    session down with them.
+    """
+
+    def __init__(self, workspace: str):
+        self._workspace = workspace
+        self._proc = None
+        self._seq = 0
+        self._lock = asyncio.Lock()  # commands share one stdin/stdout pair
+
+    async def _ensure_proc(self):
+        if self._proc is None or self._proc.returncode is not None:
+            self._proc = await asyncio.create_subprocess_exec(
+                "bash", "--noprofile", "--norc",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self._workspace,
+            )
+
+    def _kill(self):
+        if self._proc is not None and self._proc.returncode is None:
+            try:
+                self._proc.kill()
+            except ProcessLookupError:
+                pass
+        self._proc = None
+
+    @staticmethod
+    async def _read_until(stream, marker: bytes):
+        """Read until the sentinel line; return (output, sentinel tail)."""
+        buf = bytearray()
+        while True:
+            i = buf.find(marker)
+            if i != -1:
+                j = buf.find(b"\n", i)
+                if j != -1:
+                    return bytes(buf[:i]), bytes(buf[i + len(marker):j])
+            chunk = await stream.read(65536)
+            if not chunk:
+                raise RuntimeError("bash session closed unexpectedly")
+            buf += chunk
+
+    async def run(self, command: str, timeout: float = 120):
+        """Run one command; return (exit_code, stdout, stderr).
+
+        Raises asyncio.TimeoutError after killing the session if the
+        command overruns, and RuntimeError if the shell itself dies
+        (e.g. on a syntax error, which exits a non-interactive bash).
+        """
+        async with self._lock:
+            await self._ensure_proc()
+            self._seq += 1
+            marker = f"__FORGE_DONE_{os.getpid()}_{self._seq}__"
+            # Subshell isolates `exit`; sentinels on both streams mark the
+            # end of this command's output and carry the exit status. The
+            # subshell's stdin is redirected from /dev/null so commands
+            # that read stdin (`cat`, `head`) hit EOF instead of consuming
+            # the sentinel lines queued behind them on the session pipe.
+            script = (
+                f"( {command}\n) </dev/null\n"
+                f"printf '{marker} %s\\n' $?\n"
+                f"printf '{marker}\\n' >&2\n"
+            )
+            try:
+                self._proc.stdin.write(script.encode())
+                await self._proc.stdin.drain()
+                mbytes = marker.encode()
+                (out, tail), (err, _) = await asyncio.wait_for(
+                    asyncio.gather(
+                        self._read_until(self._proc.stdout, mbytes),
+                        self._read_until(self._proc.stderr, mbytes),
+                    ),
+                    timeout=timeout,
+                )
+                # Parse inside the guard: a corrupted tail means the
+                # session's framing is broken, so kill it rather than
+                # leave stale output for the next command.
+                exit_code = int(tail.strip() or 0)
+            except asyncio.TimeoutError:
+                self._kill()
+                raise
+            except Exception:
+                self._kill()
+                raise
+            return (
+                exit_code,
+                out.decode("utf-8", errors="replace"),
+                err.decode("utf-8", errors="replace"),
+            )
+
+
+# One session per (event loop, workspace) — subprocess transports are
+# bound to the loop that created them.
+_BASH_SESSIONS: dict = {}
+
+
+def _get_bash_session(workspace: str) -> _BashSession:
+    loop_key = id(asyncio.get_running_loop())
+    key = (loop_key, workspace)
+    session = _BASH_SESSIONS.get(key)
+    if session is None:
+        # Drop entries whose shell already exited to keep the table small
+        for k, s in list(_BASH_SESSIONS.items()):
+            if s._proc is not None and s._proc.returncode is not None:
+                del _BASH_SESSIONS[k]
+        session = _BashSession(workspace)
+        _BASH_SESSIONS[key] = session
+    return session
+
+
 async def run_in_bash_session(
     command: str, tool_context: ToolContext = None, workspace: str = ""
 ) -> dict:
@@ -24,12 +153,28 @@ async def run_in_bash_session(
 
     Captures stdout and stderr. Timeout after 120 seconds.
     Most-used tool — called for installing deps, running tests, linting, etc.
+    Commands reuse a persistent bash process per workspace; if the session
+    path is unavailable (no bash, dead shell) it falls back to a one-shot
+    subprocess.
 
     Emits AG-UI TOOL_CALL events + CUSTOM bashOutput artifact in production.
     """
     ws = workspace or get_workspace(tool_context)
-    
-    # Use subprocess.run via to_thread for Windows compatibility and simplicity
+
+    try:
+        exit_code, stdout, stderr = await _get_bash_session(ws).run(command)
+        return {
+            "exit_code": exit_code,
+            "stdout": stdout,
+            "stderr": stderr,
+            "command": command,
+        }
+    except asyncio.TimeoutError:
+        return {"error": "Command timed out after 120s", "command": command}
+    except Exception:
+        pass  # session unusable — fall through to the one-shot path
+
+    # One-shot fallback via to_thread for portability
     def _run():
         return subprocess.run(
             command,
@@ -91,6 +236,18 @@ def test_frontend():
     return {"instructions": instructions}
 
 
+def _encode_screenshot(fpath: str) -> str:
+    """Base64-encode one screenshot via mmap — no full in-memory copy of
+    the raw bytes before encoding."""
+    with open(fpath, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _b64encode_str(mm)
+        except ValueError:
+            # Empty files can't be mmapped
+            return ""
+
+
 async def frontend_verification_complete(
     notes: str = "", tool_context: ToolContext = None, workspace: str = ""
 ) -> dict:
@@ -102,20 +259,28 @@ async def frontend_verification_complete(
     ws = workspace or WORKSPACE_ROOT
     screenshot_dir = os.path.join(ws, "forge_scratchpad", "screenshots")
 
-    if not os.path.isdir(screenshot_dir):
+    # scandir doubles as the directory check and hands back DirEntry
+    # objects, so no per-file lstat or path re-join is needed.
+    try:
+        with os.scandir(screenshot_dir) as it:
+            entries = [
+                e for e in it
+                if e.name.lower().endswith((".png", ".jpg", ".jpeg")) and e.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
         return {"error": "No screenshots directory found. Run tests first."}
+    entries.sort(key=lambda e: e.name)
 
-    screenshots = []
-    for fname in sorted(os.listdir(screenshot_dir)):
-        if fname.lower().endswith((".png", ".jpg", ".jpeg")):
-            fpath = os.path.join(screenshot_dir, fname)
-            try:
-                async with aiofiles.open(fpath, "rb") as f:
-                    raw = await f.read()
-                data = base64.b64encode(raw).decode("ascii")
-                screenshots.append({"filename": fname, "base64": data})
-            except Exception as exc:
-                screenshots.append({"filename": fname, "error": str(exc)})
+    async def _encode_entry(entry) -> dict:
+        try:
+            data = await asyncio.to_thread(_encode_screenshot, entry.path)
+            return {"filename": entry.name, "base64": data}
+        except Exception as exc:
+            return {"filename": entry.name, "error": str(exc)}
+
+    # Encode in parallel — reads and base64 work overlap across files,
+    # and gather preserves the sorted order.
+    screenshots = list(await asyncio.gather(*(_encode_entry(e) for e in entries)))
 
     if not screenshots:
         return {"error": "No screenshot files found in /workspace/forge_scratchpad/screenshots/"}
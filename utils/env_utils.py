@@ -0,0 +1,33 @@
+"""
+Env Utils — cached snapshot of hot-path environment variables.
+
+os.environ.get is a dict probe plus a string allocation, and the same
+handful of variables are resolved on every agent construction and every
+service-factory call. Snapshot them once behind an lru_cache; tests that
+monkeypatch the environment invalidate via ``env_snapshot.cache_clear()``
+(wired up as an autouse fixture in tests/conftest.py).
+"""
+
+import os
+from functools import lru_cache
+from typing import NamedTuple
+
+
+class EnvSnapshot(NamedTuple):
+    service_mode: str
+    gemini_model: str
+    project: str | None
+    location: str
+    agent_engine_id: str | None
+
+
+@lru_cache(maxsize=1)
+def env_snapshot() -> EnvSnapshot:
+    """Return the cached snapshot of hot-path environment variables."""
+    return EnvSnapshot(
+        service_mode=os.environ.get("SERVICE_MODE", "dev"),
+        gemini_model=os.environ.get("GEMINI_MODEL", "gemini-2.5-pro"),
+        project=os.environ.get("GOOGLE_CLOUD_PROJECT"),
+        location=os.environ.get("GOOGLE_CLOUD_LOCATION", "us-central1"),
+        agent_engine_id=os.environ.get("AGENT_ENGINE_ID"),
+    )
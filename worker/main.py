@@ -8,6 +8,7 @@ Forge Worker — Docker container entry point.
 """
 
 import os
+import re
 import sys
 import asyncio
 import logging
@@ -40,10 +41,23 @@ from agent.agent import create_agent
 # Enable ProactorEventLoop on Windows for async subprocesses
 if sys.platform == "win32":
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+else:
+    # uvloop (libuv-backed loop) noticeably speeds up the async tool and
+    # HTTP workload; soft dependency, stdlib loop is the fallback.
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
 
 from google.adk.apps import App, ResumabilityConfig
 from google.adk.agents.context_cache_config import ContextCacheConfig
 
+# Transient-error signatures worth retrying — compiled once, matched per raise
+_RATE_LIMIT_RE = re.compile(
+    r"429|resource exhausted|rate limit|quota|unavailable|overloaded|try again"
+)
+
 # ---------------------------------------------------------------------------
 # ADK Web App Definition
 # ---------------------------------------------------------------------------
@@ -265,15 +279,7 @@ async def run_worker(task_arg: str | None = None, session_id_arg: str | None = N
 
         except Exception as exc:
             exc_str = str(exc).lower()
-            is_rate_limit = (
-                "429" in exc_str
-                or "resource exhausted" in exc_str
-                or "rate limit" in exc_str
-                or "quota" in exc_str
-                or "unavailable" in exc_str
-                or "overloaded" in exc_str
-                or "try again" in exc_str
-            )
+            is_rate_limit = bool(_RATE_LIMIT_RE.search(exc_str))
             if is_rate_limit and attempt < max_retries:
                 wait = retry_delay * (2 ** attempt)
                 logger.warning(